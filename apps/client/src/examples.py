@@ -5,20 +5,22 @@ This module demonstrates various ways to use the MCP connection utilities.
 """
 
 import asyncio
+from functools import partial
 
 from apps.client.src.logging_config import logger
 from apps.client.src.mcp_connection import (
+    MCPConnectionPool,
     connect_to_mcp_server,
     get_server_info,
     test_connection,
 )
 
 
-async def example_basic_connection():
+async def example_basic_connection(pool: MCPConnectionPool):
     """Example: Basic connection and tool listing."""
     logger.info("=== Basic Connection Example ===")
 
-    async with connect_to_mcp_server() as session:
+    async with pool.acquire() as session:
         server_info = await get_server_info(session)
 
         logger.info(f"Connected! Found {len(server_info['tools'])} tools")
@@ -40,11 +42,11 @@ async def example_custom_server_path():
         )
 
 
-async def example_tool_execution():
+async def example_tool_execution(pool: MCPConnectionPool):
     """Example: Executing a tool."""
     logger.info("=== Tool Execution Example ===")
 
-    async with connect_to_mcp_server() as session:
+    async with pool.acquire() as session:
         try:
             # Call the add tool
             result = await session.call_tool("add", arguments={"a": 5, "b": 3})
@@ -53,11 +55,11 @@ async def example_tool_execution():
             logger.error(f"Tool execution failed: {e}")
 
 
-async def example_resource_access():
+async def example_resource_access(pool: MCPConnectionPool):
     """Example: Accessing server resources."""
     logger.info("=== Resource Access Example ===")
 
-    async with connect_to_mcp_server() as session:
+    async with pool.acquire() as session:
         try:
             # List resources
             resources_result = await session.list_resources()
@@ -113,21 +115,23 @@ async def example_error_handling():
 
 async def run_all_examples():
     """Run all examples in sequence."""
-    examples = [
-        example_basic_connection,
-        example_custom_server_path,
-        example_tool_execution,
-        example_resource_access,
-        example_connection_testing,
-        example_error_handling,
-    ]
-
-    for example_func in examples:
-        try:
-            await example_func()
-            logger.info("✅ Example completed successfully\n")
-        except Exception as e:
-            logger.error(f"❌ Example failed: {e}\n")
+    # Examples against the default server share warm connections from a pool
+    async with MCPConnectionPool() as pool:
+        examples = [
+            partial(example_basic_connection, pool),
+            example_custom_server_path,
+            partial(example_tool_execution, pool),
+            partial(example_resource_access, pool),
+            example_connection_testing,
+            example_error_handling,
+        ]
+
+        for example_func in examples:
+            try:
+                await example_func()
+                logger.info("✅ Example completed successfully\n")
+            except Exception as e:
+                logger.error(f"❌ Example failed: {e}\n")
 
 
 if __name__ == "__main__":
@@ -1,32 +1,150 @@
+import atexit
 import logging
+import logging.handlers
 import os
+import queue
 import sys
+import threading
+import time
 
-# Add src directory to Python path so modules can import from src
-current_dir = os.path.dirname(os.path.abspath(__file__))
-src_dir = (
-    os.path.dirname(current_dir)
-    if os.path.basename(current_dir) != "src"
-    else current_dir
+# Add src directory to Python path so modules can import from src;
+# this module lives in src and __file__ is already absolute on import
+_SRC = os.path.dirname(__file__)
+if _SRC not in sys.path:
+    sys.path.insert(0, _SRC)
+
+# Level names padded like "%(levelname)-8s", computed once
+_LEVEL_PADDED = {
+    name: f"{name:<8}" for name in ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL")
+}
+
+
+class CachedTimeFormatter(logging.Formatter):
+    """Formatter for "[<date>] <LEVEL> <message>" lines.
+
+    The formatted timestamp is cached per second, so strftime runs at most
+    once per second rather than once per record, and level names come from
+    a precomputed table.
+    """
+
+    def __init__(self, datefmt: str = "%m/%d/%y %H:%M:%S"):
+        super().__init__(datefmt=datefmt)
+        self._last_second = None
+        self._last_timestamp = ""
+
+    def format(self, record: logging.LogRecord) -> str:
+        second = int(record.created)
+        if second != self._last_second:
+            self._last_timestamp = time.strftime(self.datefmt, self.converter(second))
+            self._last_second = second
+
+        level = _LEVEL_PADDED.get(record.levelname) or f"{record.levelname:<8}"
+        message = "".join(
+            ("[", self._last_timestamp, "] ", level, " ", record.getMessage())
+        )
+
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            message = message + "\n" + record.exc_text
+        if record.stack_info:
+            message = message + "\n" + self.formatStack(record.stack_info)
+        return message
+
+
+class BufferedStreamHandler(logging.StreamHandler):
+    """StreamHandler that batches writes instead of flushing every record.
+
+    The stream is flushed once `flush_every` records have been written, or
+    immediately for records at or above `flush_level`, like MemoryHandler.
+    A daemon thread flushes it every `flush_interval` seconds so quiet
+    periods do not leave lines sitting in the buffer.
+    """
+
+    def __init__(
+        self,
+        stream,
+        flush_every: int = 64,
+        flush_interval: float = 1.0,
+        flush_level: int = logging.WARNING,
+    ):
+        super().__init__(stream)
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.flush_level = flush_level
+        self._pending = 0
+        threading.Thread(target=self._flush_periodically, daemon=True).start()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+            self._pending += 1
+            if self._pending >= self.flush_every or record.levelno >= self.flush_level:
+                self.flush()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+    def flush(self) -> None:
+        # The lock is reentrant, so emit() can flush while already holding it
+        with self.lock:
+            super().flush()
+            self._pending = 0
+
+    def _flush_periodically(self) -> None:
+        while True:
+            time.sleep(self.flush_interval)
+            if self._pending:
+                self.flush()
+
+
+def _buffered_stream(stream):
+    """Open a block-buffered text stream on `stream` that never closes its fd."""
+    try:
+        return open(
+            stream.fileno(),
+            "w",
+            buffering=65536,
+            encoding=stream.encoding,
+            errors="backslashreplace",
+            closefd=False,
+        )
+    except (AttributeError, OSError, ValueError):
+        # The stream was replaced by an object without a real file descriptor
+        return stream
+
+
+# Log to stderr by default: under the stdio transport, stdout carries the MCP
+# protocol and any log line written there corrupts it
+log_target = (
+    sys.stdout if os.environ.get("MCP_LOG_STREAM", "stderr") == "stdout" else sys.stderr
 )
-if src_dir not in sys.path:
-    sys.path.insert(0, src_dir)
 
-# Create and configure the logger
+
+# Create and configure the logger; it already drops records below INFO,
+# so the handler needs no level of its own
 logger = logging.getLogger("mcp_app")
 logger.setLevel(logging.INFO)
+logger.propagate = False  # Prevent duplicate logs
 
 # Create console handler
-handler = logging.StreamHandler(sys.stdout)
-handler.setLevel(logging.INFO)
-
-# Create simple formatter
-formatter = logging.Formatter(
-    "[%(asctime)s] %(levelname)-8s %(message)s", datefmt="%m/%d/%y %H:%M:%S"
-)
+handler = BufferedStreamHandler(_buffered_stream(log_target))
+handler.setFormatter(CachedTimeFormatter())
 
-handler.setFormatter(formatter)
-logger.addHandler(handler)
+# Hand records to a background listener. QueueHandler.prepare still merges the
+# message with its arguments on the calling thread; the timestamp and level
+# formatting and the write to the stream happen on the listener's thread
+log_queue = queue.SimpleQueue()
+logger.addHandler(logging.handlers.QueueHandler(log_queue))
+listener = logging.handlers.QueueListener(log_queue, handler)
+listener.start()
+# atexit runs in reverse order: drain the queue first, then flush the buffer
+atexit.register(handler.flush)
+atexit.register(listener.stop)
 
-# Prevent duplicate logs
-logger.propagate = False
+# Pre-bound logging methods, resolved once so hot call sites skip the lookup
+debug = logger.debug
+info = logger.info
+warning = logger.warning
+error = logger.error
@@ -6,20 +6,154 @@ resource management and error handling.
 """
 
 import asyncio
-from contextlib import asynccontextmanager
-from typing import Any, AsyncGenerator, Dict, Optional
+import json
+import math
+import os
+import time
+from collections import defaultdict, deque
+from contextlib import asynccontextmanager, nullcontext
+from typing import (
+    Any,
+    AsyncContextManager,
+    AsyncGenerator,
+    Awaitable,
+    Deque,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
 
+import anyio
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
 
 from apps.client.src.logging_config import logger
 
+T = TypeVar("T")
+
+# Errors raised by a session whose transport has gone away
+_TRANSPORT_ERRORS = (
+    anyio.ClosedResourceError,
+    anyio.BrokenResourceError,
+    anyio.EndOfStream,
+)
+
+
+class McpProfiler:
+    """
+    Lightweight timing of MCP and OpenAI calls.
+
+    Each span records its name, tags and duration. Aggregated p50/p95
+    timings per span are logged, and the records cleared, when a session
+    closes. Profiling is off unless the `MCP_PROFILE` environment variable
+    is set to "1"; while it is off, spans cost nothing beyond returning a
+    shared null context.
+
+    Args:
+        enabled: Whether to record spans (default: from `MCP_PROFILE`)
+        max_records: Maximum number of spans kept (default: 10000)
+    """
+
+    def __init__(self, enabled: Optional[bool] = None, max_records: int = 10000):
+        if enabled is None:
+            enabled = os.environ.get("MCP_PROFILE") == "1"
+        self.enabled = enabled
+        self.records: Deque[Tuple[str, Dict[str, Any], int]] = deque(maxlen=max_records)
+        self._null_span = nullcontext()
+
+    def span(self, name: str, **tags: Any) -> AsyncContextManager[None]:
+        """
+        Time the enclosed block.
+
+        Args:
+            name: Name of the timed step (e.g. "list_tools")
+            **tags: Extra labels to group the timing by (e.g. tool name)
+
+        Example:
+            async with profiler.span("call_tool", tool="add"):
+                await session.call_tool("add", {"a": 1, "b": 2})
+        """
+        if not self.enabled:
+            return self._null_span
+        return self._timed_span(name, tags)
+
+    @asynccontextmanager
+    async def _timed_span(
+        self, name: str, tags: Dict[str, Any]
+    ) -> AsyncGenerator[None, None]:
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.records.append((name, tags, time.perf_counter_ns() - start))
+
+    def measure(self, name: str, awaitable: Awaitable[T], **tags: Any) -> Awaitable[T]:
+        """
+        Time an awaitable, e.g. as one branch of a gather.
+
+        Args:
+            name: Name of the timed step
+            awaitable: The awaitable to time
+            **tags: Extra labels to group the timing by
+
+        Returns:
+            The awaitable itself when profiling is off, else one that times it
+        """
+        if not self.enabled:
+            return awaitable
+        return self._timed_await(name, awaitable, tags)
+
+    async def _timed_await(
+        self, name: str, awaitable: Awaitable[T], tags: Dict[str, Any]
+    ) -> T:
+        async with self._timed_span(name, tags):
+            return await awaitable
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """
+        Aggregate recorded spans by name and tags.
+
+        Returns:
+            Dict mapping each span label to its count and p50/p95 in milliseconds
+        """
+        durations: Dict[str, List[int]] = defaultdict(list)
+        for name, tags, ns in self.records:
+            label = name
+            if tags:
+                label += "(" + ",".join(f"{k}={v}" for k, v in tags.items()) + ")"
+            durations[label].append(ns)
+
+        def percentile(values: List[int], p: float) -> float:
+            return values[max(math.ceil(p * len(values)) - 1, 0)] / 1e6
+
+        result = {}
+        for label, values in durations.items():
+            values.sort()
+            result[label] = {
+                "count": len(values),
+                "p50_ms": percentile(values, 0.50),
+                "p95_ms": percentile(values, 0.95),
+            }
+        return result
+
+    def log_summary(self) -> None:
+        """Log the aggregated timings as a single JSON line and clear them."""
+        if self.enabled and self.records:
+            logger.info("MCP profile: %s", json.dumps(self.summary()))
+            self.records.clear()
+
+
+profiler = McpProfiler()
+
 
 @asynccontextmanager
 async def connect_to_mcp_server(
     server_script_path: str = "apps/mcp_server/src/server.py",
     command: str = "python",
     timeout: Optional[float] = 30.0,
+    closed: Optional[asyncio.Event] = None,
 ) -> AsyncGenerator[ClientSession, None]:
     """
     Connect to an MCP server using stdio transport.
@@ -27,20 +161,24 @@ async def connect_to_mcp_server(
     This context manager handles the complete lifecycle of the MCP connection:
     - Sets up stdio transport parameters
     - Establishes connection with proper resource management
-    - Initializes the session with timeout
+    - Initializes the session, bounding the handshake with a timeout
     - Ensures cleanup on exit
 
     Args:
         server_script_path: Path to the MCP server script
         command: Command to run the server (default: "python")
-        timeout: Connection timeout in seconds (default: 30.0)
+        timeout: Connection timeout in seconds, or None for no timeout
+            (default: 30.0)
+        closed: Optional event that is set once the server side of the
+            transport closes, e.g. because the server process died
 
     Yields:
         ClientSession: An initialized MCP client session
 
     Raises:
+        ValueError: If timeout is not positive
         asyncio.TimeoutError: If connection times out
-        ConnectionError: If connection fails
+        ConnectionError: If session initialization fails
 
     Example:
         async with connect_to_mcp_server() as session:
@@ -53,35 +191,197 @@ async def connect_to_mcp_server(
         args=[server_script_path],
     )
 
-    try:
-        # Connect to the server with proper resource management and timeout
-        async with asyncio.timeout(timeout) if timeout else asyncio.nullcontext():
-            async with stdio_client(server_params) as (read_stream, write_stream):
-                async with ClientSession(read_stream, write_stream) as session:
-                    try:
-                        # Initialize the connection
-                        await session.initialize()
-                        logger.info(
-                            f"Successfully connected to MCP server: {server_script_path}"
-                        )
-
-                        # Yield the initialized session
-                        yield session
-
-                    except Exception as e:
-                        logger.error(f"Failed to initialize MCP session: {e}")
-                        raise ConnectionError(
-                            f"MCP session initialization failed: {e}"
-                        ) from e
-                    finally:
-                        logger.debug("MCP session cleanup completed")
-
-    except asyncio.TimeoutError:
-        logger.error(f"Connection to MCP server timed out after {timeout}s")
-        raise
-    except Exception as e:
-        logger.error(f"Failed to connect to MCP server: {e}")
-        raise ConnectionError(f"MCP server connection failed: {e}") from e
+    # asyncio.timeout(0) can swallow a pending cancellation, so fail fast instead
+    if timeout is not None and timeout <= 0:
+        raise ValueError(f"MCP connection timeout must be positive: {timeout}")
+
+    # Only the handshake is bounded; the timeout must not cover the session's use
+    init_timeout = asyncio.timeout(timeout) if timeout is not None else nullcontext()
+
+    # Connect to the server with proper resource management
+    async with stdio_client(server_params) as (read_stream, write_stream):
+        if closed is not None:
+            read_stream = _WatchedReadStream(read_stream, closed)
+        async with ClientSession(read_stream, write_stream) as session:
+            try:
+                # Initialize the connection
+                async with init_timeout, profiler.span("initialize"):
+                    await session.initialize()
+            except asyncio.TimeoutError:
+                logger.error("Connection to MCP server timed out after %ss", timeout)
+                raise
+            except Exception as e:
+                logger.error("Failed to initialize MCP session: %s", e)
+                raise ConnectionError(f"MCP session initialization failed: {e}") from e
+
+            logger.info("Successfully connected to MCP server: %s", server_script_path)
+
+            try:
+                # Yield the initialized session
+                yield session
+            finally:
+                server_info_cache.invalidate(session)
+                profiler.log_summary()
+                logger.debug("MCP session cleanup completed")
+
+
+class _WatchedReadStream:
+    """
+    Read stream wrapper that sets an event once the session stops reading.
+
+    The session's receive loop holds the read stream open for as long as the
+    server keeps sending, and closes it when the transport ends.
+    """
+
+    def __init__(self, stream: Any, closed: asyncio.Event):
+        self._stream = stream
+        self._closed = closed
+
+    async def __aenter__(self) -> "_WatchedReadStream":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self._closed.set()
+        await self._stream.aclose()
+
+    def __aiter__(self) -> "_WatchedReadStream":
+        return self
+
+    async def __anext__(self) -> Any:
+        return await self._stream.__anext__()
+
+    async def aclose(self) -> None:
+        await self._stream.aclose()
+
+
+class MCPConnectionPool:
+    """
+    Pool of warm MCP server connections.
+
+    Spawning the server subprocess and initializing a session is expensive,
+    so connections are kept open and reused across `acquire()` calls. Each
+    connection is owned by a background task that keeps its stdio transport
+    open until the connection is released for good.
+
+    Args:
+        server_script_path: Path to the MCP server script
+        command: Command to run the server (default: "python")
+        max_size: Number of idle connections kept warm (default: 2)
+        burst_limit: Extra connections allowed temporarily under load;
+            these are closed on release instead of being kept (default: 2)
+        timeout: Connection timeout in seconds (default: 30.0)
+
+    Example:
+        async with MCPConnectionPool() as pool:
+            async with pool.acquire() as session:
+                result = await session.call_tool("add", {"a": 1, "b": 2})
+    """
+
+    def __init__(
+        self,
+        server_script_path: str = "apps/mcp_server/src/server.py",
+        command: str = "python",
+        max_size: int = 2,
+        burst_limit: int = 2,
+        timeout: Optional[float] = 30.0,
+    ):
+        self.server_script_path = server_script_path
+        self.command = command
+        self.max_size = max_size
+        self.timeout = timeout
+        self._idle: Deque[Tuple[ClientSession, asyncio.Task, asyncio.Event]] = deque()
+        self._semaphore = asyncio.Semaphore(max_size + burst_limit)
+        self._closed = False
+
+    async def __aenter__(self) -> "MCPConnectionPool":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def _serve(self, ready: asyncio.Future, release: asyncio.Event) -> None:
+        """Own a single connection until it is released or its transport closes."""
+        try:
+            async with connect_to_mcp_server(
+                self.server_script_path, self.command, timeout=None, closed=release
+            ) as session:
+                ready.set_result(session)
+                await release.wait()
+        except Exception as e:
+            if not ready.done():
+                ready.set_exception(e)
+            else:
+                logger.error("Pooled MCP connection failed: %s", e)
+
+    async def _spawn(self) -> Tuple[ClientSession, asyncio.Task, asyncio.Event]:
+        """Start a new connection and wait until its session is initialized."""
+        ready = asyncio.get_running_loop().create_future()
+        release = asyncio.Event()
+        task = asyncio.create_task(self._serve(ready, release))
+
+        try:
+            session = await asyncio.wait_for(asyncio.shield(ready), self.timeout)
+        except BaseException:
+            release.set()
+            task.cancel()
+            raise
+
+        logger.debug("Spawned new pooled MCP connection")
+        return session, task, release
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncGenerator[ClientSession, None]:
+        """
+        Check out a connection from the pool.
+
+        Reuses an idle connection when one is available, otherwise spawns a
+        new one. The connection is returned to the pool on exit unless it
+        has died, the block raised a transport error, or the pool is already
+        holding `max_size` idle connections.
+
+        Yields:
+            ClientSession: An initialized MCP client session
+
+        Raises:
+            RuntimeError: If the pool has been closed
+        """
+        if self._closed:
+            raise RuntimeError("MCP connection pool is closed")
+
+        async with self._semaphore:
+            conn = None
+            while self._idle:
+                candidate = self._idle.pop()
+                if not candidate[2].is_set():
+                    conn = candidate
+                    break
+
+            if conn is None:
+                conn = await self._spawn()
+
+            dead = False
+            try:
+                yield conn[0]
+            except _TRANSPORT_ERRORS:
+                dead = True
+                raise
+            finally:
+                if dead or self._closed or len(self._idle) >= self.max_size:
+                    conn[2].set()
+                elif not conn[2].is_set():
+                    self._idle.append(conn)
+
+    async def close(self) -> None:
+        """Close all idle connections and refuse further acquisitions."""
+        self._closed = True
+        tasks = []
+        while self._idle:
+            _, task, release = self._idle.popleft()
+            release.set()
+            tasks.append(task)
+
+        await asyncio.gather(*tasks, return_exceptions=True)
+        logger.debug("MCP connection pool closed")
 
 
 async def get_server_info(session: ClientSession) -> Dict[str, Any]:
@@ -94,32 +394,120 @@ async def get_server_info(session: ClientSession) -> Dict[str, Any]:
     Returns:
         Dict containing server tools, resources, and other metadata
     """
-    info = {"tools": [], "resources": [], "server_info": {}}
+    info = {"tools": [], "resources": [], "server_info": {}, "tool_schema_chars": 0}
 
     try:
-        # Get available tools
-        tools_result = await session.list_tools()
+        # List tools and resources concurrently; the requests are independent
+        tools_result, resources_result = await asyncio.gather(
+            profiler.measure("list_tools", session.list_tools()),
+            profiler.measure("list_resources", session.list_resources()),
+        )
+
         info["tools"] = [
-            {"name": tool.name, "description": tool.description}
+            {
+                "name": tool.name,
+                "description": tool.description,
+                "inputSchema": tool.inputSchema,
+            }
             for tool in tools_result.tools
         ]
-        logger.debug(f"Found {len(info['tools'])} tools")
+        logger.debug("Found %d tools", len(info["tools"]))
+
+        # Measured once per fetch so choosing the tool mode per query is a lookup
+        info["tool_schema_chars"] = sum(
+            len(json.dumps(tool["inputSchema"] or {})) for tool in info["tools"]
+        )
 
-        # Get available resources
-        resources_result = await session.list_resources()
         info["resources"] = [
             {"name": resource.name, "description": resource.description}
             for resource in resources_result.resources
         ]
-        logger.debug(f"Found {len(info['resources'])} resources")
+        logger.debug("Found %d resources", len(info["resources"]))
 
         return info
 
     except Exception as e:
-        logger.error(f"Failed to get server info: {e}")
+        logger.error("Failed to get server info: %s", e)
         raise
 
 
+class ServerInfoCache:
+    """
+    Per-session TTL cache for MCP server metadata.
+
+    Tool and resource listings are effectively static for the lifetime of a
+    session, so they are fetched once and reused until the TTL expires.
+    Concurrent callers for the same session share a single in-flight fetch.
+
+    Args:
+        ttl: Seconds a cached entry stays fresh (default: 300.0)
+    """
+
+    def __init__(self, ttl: float = 300.0):
+        self.ttl = ttl
+        self._entries: Dict[int, Dict[str, Any]] = {}
+        self._locks: Dict[int, asyncio.Lock] = {}
+
+    def _fresh(self, key: int) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(key)
+        if entry and time.monotonic() - entry["fetched_at"] < self.ttl:
+            return entry["info"]
+        return None
+
+    async def get(self, session: ClientSession) -> Dict[str, Any]:
+        """
+        Return the server info for a session, fetching it on a miss.
+
+        Args:
+            session: An active MCP client session
+
+        Returns:
+            Dict containing server tools, resources, and other metadata
+        """
+        key = id(session)
+        info = self._fresh(key)
+        if info is not None:
+            return info
+
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            # Another caller may have populated the entry while we waited
+            info = self._fresh(key)
+            if info is not None:
+                return info
+
+            info = await get_server_info(session)
+            self._entries[key] = {"info": info, "fetched_at": time.monotonic()}
+            return info
+
+    def invalidate(self, session: ClientSession) -> None:
+        """
+        Drop the cached server info for a session.
+
+        Args:
+            session: The MCP client session to forget
+        """
+        key = id(session)
+        self._entries.pop(key, None)
+        self._locks.pop(key, None)
+
+
+server_info_cache = ServerInfoCache()
+
+
+async def get_cached_server_info(session: ClientSession) -> Dict[str, Any]:
+    """
+    Get server information, reusing a recent listing for the same session.
+
+    Args:
+        session: An active MCP client session
+
+    Returns:
+        Dict containing server tools, resources, and other metadata
+    """
+    return await server_info_cache.get(session)
+
+
 async def test_connection(
     server_script_path: str = "apps/mcp_server/src/server.py", command: str = "python"
 ) -> bool:
@@ -141,5 +529,5 @@ async def test_connection(
             logger.info("MCP server connection test successful")
             return True
     except Exception as e:
-        logger.error(f"MCP server connection test failed: {e}")
+        logger.error("MCP server connection test failed: %s", e)
         return False
@@ -1,13 +1,33 @@
+import asyncio
 import json
+import logging
 import os
+import re
 import traceback
 from typing import Any, Dict, List, Optional
 
 import openai
+from dotenv import load_dotenv
 
 from apps.client.src.logging_config import logger
-from apps.client.src.resources import get_mcp_resources
-from apps.client.src.tools import get_mcp_tools
+from apps.client.src.mcp_connection import get_cached_server_info, profiler
+from apps.client.src.resources import format_mcp_resources
+from apps.client.src.tools import (
+    SELECT_TOOL_NAME,
+    build_select_tool,
+    format_mcp_tool_index,
+    format_mcp_tools,
+    get_mcp_tool_schema,
+    use_lazy_tool_schemas,
+)
+
+# Prefer orjson for decoding tool arguments when it is installed
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
 
 # TODO: These should be imported from a config module
 # For now, assuming they exist in the global scope
@@ -19,8 +39,19 @@ RESOURCES_PROMPT = "\n\nAvailable Resources (use tools to fetch content):\n"
 TOOL_USAGE_PROMPT = "\nUse the appropriate tools to fetch resource content when needed."
 TOOL_CHOICE_AUTO = "auto"
 TOOL_CHOICE_NONE = "none"
-
-# Environment setup
+MAX_TOOL_CONCURRENCY = 4
+MAX_TOOL_SELECTION_ROUNDS = 3
+# Tools whose output can be returned to the user as-is
+PASSTHROUGH_TOOLS = frozenset({"read_resource_content"})
+TOOL_ERROR_PREFIXES = ("Error", "Unknown resource URI")
+BATCH_PROMPT = (
+    "Answer each of the following questions. Reply with a numbered list "
+    "using the same numbers, one answer per item:\n"
+)
+
+# Environment setup; the client reads .env here, so importing the package
+# (e.g. logging_config from the server) does not touch the filesystem
+load_dotenv(".env")
 openai_api_key = os.getenv("OPENAI_API_KEY")
 if not openai_api_key:
     logger.error("OPENAI_API_KEY not found in environment variables")
@@ -40,17 +71,16 @@ def _build_system_message(resources_info: Optional[List[Dict[str, Any]]]) -> str
     Returns:
         The formatted system message string.
     """
-    system_message = SYSTEM_MESSAGE_BASE
-
-    if resources_info:
-        system_message += RESOURCES_PROMPT
-        for resource in resources_info:
-            name = resource["resource"]["name"]
-            description = resource["resource"]["description"]
-            system_message += f"- {name}: {description}\n"
-        system_message += TOOL_USAGE_PROMPT
+    if not resources_info:
+        return SYSTEM_MESSAGE_BASE
 
-    return system_message
+    parts = [SYSTEM_MESSAGE_BASE, RESOURCES_PROMPT]
+    parts.extend(
+        f"- {resource['resource']['name']}: {resource['resource']['description']}\n"
+        for resource in resources_info
+    )
+    parts.append(TOOL_USAGE_PROMPT)
+    return "".join(parts)
 
 
 def _log_resources_info(resources_info: Optional[List[Dict[str, Any]]]) -> None:
@@ -59,10 +89,13 @@ def _log_resources_info(resources_info: Optional[List[Dict[str, Any]]]) -> None:
     Args:
         resources_info: List of resource information dictionaries.
     """
-    logger.info(f"Retrieved {len(resources_info) if resources_info else 0} resources")
+    if not logger.isEnabledFor(logging.INFO):
+        return
+
+    logger.info("Retrieved %d resources", len(resources_info) if resources_info else 0)
     if resources_info:
         resource_names = [resource["resource"]["name"] for resource in resources_info]
-        logger.info(f"Available resources: {resource_names}")
+        logger.info("Available resources: %s", resource_names)
 
 
 def _log_tools_info(tools: Optional[List[Dict[str, Any]]]) -> None:
@@ -71,12 +104,15 @@ def _log_tools_info(tools: Optional[List[Dict[str, Any]]]) -> None:
     Args:
         tools: List of tool dictionaries.
     """
+    if not logger.isEnabledFor(logging.INFO):
+        return
+
     tool_names = (
         [tool.get("function", {}).get("name", "unknown") for tool in tools]
         if tools
         else "None"
     )
-    logger.info(f"Retrieved {len(tools) if tools else 0} tools: {tool_names}")
+    logger.info("Retrieved %d tools: %s", len(tools) if tools else 0, tool_names)
 
 
 def _log_assistant_response(assistant_message) -> None:
@@ -85,13 +121,15 @@ def _log_assistant_response(assistant_message) -> None:
     Args:
         assistant_message: The assistant's message object.
     """
-    content_preview = (assistant_message.content or "None")[:100]
-    logger.info(f"Assistant message content preview: {content_preview}...")
-    logger.info(f"Tool calls present: {assistant_message.tool_calls is not None}")
+    logger.info(
+        "Assistant message content preview: %.100s...",
+        assistant_message.content or "None",
+    )
+    logger.info("Tool calls present: %s", assistant_message.tool_calls is not None)
 
-    if assistant_message.tool_calls:
+    if assistant_message.tool_calls and logger.isEnabledFor(logging.INFO):
         tool_call_names = [tc.function.name for tc in assistant_message.tool_calls]
-        logger.info(f"Tool calls requested: {tool_call_names}")
+        logger.info("Tool calls requested: %s", tool_call_names)
 
 
 async def _execute_single_tool_call(
@@ -109,22 +147,24 @@ async def _execute_single_tool_call(
         Dictionary with role, tool_call_id, and content for the message.
     """
     try:
-        logger.info(f"Executing tool {index+1}/{total}: {tool_call.function.name}")
-        logger.debug(f"Tool arguments: {tool_call.function.arguments}")
+        logger.info(
+            "Executing tool %d/%d: %s", index + 1, total, tool_call.function.name
+        )
+        logger.debug("Tool arguments: %s", tool_call.function.arguments)
 
         # Parse and log the arguments
-        parsed_args = json.loads(tool_call.function.arguments)
-        logger.info(f"Parsed tool arguments: {parsed_args}")
+        parsed_args = _json_loads(tool_call.function.arguments)
+        logger.debug("Parsed tool arguments: %s", parsed_args)
 
         # Execute tool call
-        result = await session.call_tool(
-            tool_call.function.name,
-            arguments=parsed_args,
-        )
+        async with profiler.span("call_tool", tool=tool_call.function.name):
+            result = await session.call_tool(
+                tool_call.function.name,
+                arguments=parsed_args,
+            )
 
-        logger.info(f"Tool {tool_call.function.name} executed successfully")
-        logger.debug(f"Tool result preview: {str(result.content[0].text)[:200]}...")
-        logger.info(f"Full tool result content: {result.content[0].text}")
+        logger.info("Tool %s executed successfully", tool_call.function.name)
+        logger.debug("Tool result preview: %.200s...", result.content[0].text)
 
         return {
             "role": "tool",
@@ -133,8 +173,8 @@ async def _execute_single_tool_call(
         }
 
     except Exception as e:
-        logger.error(f"Error executing tool {tool_call.function.name}: {e}")
-        logger.error(f"Tool arguments were: {tool_call.function.arguments}")
+        logger.error("Error executing tool %s: %s", tool_call.function.name, e)
+        logger.error("Tool arguments were: %s", tool_call.function.arguments)
 
         return {
             "role": "tool",
@@ -145,23 +185,134 @@ async def _execute_single_tool_call(
 
 async def _process_tool_calls(
     session, assistant_message, messages: List[Dict[str, Any]]
-) -> None:
+) -> List[Dict[str, str]]:
     """Process all tool calls from the assistant's response.
 
     Args:
         session: The MCP session.
         assistant_message: The assistant's message with tool calls.
         messages: The conversation messages list to append tool results to.
+
+    Returns:
+        The tool result messages, in the order of the tool calls.
     """
     tool_calls = assistant_message.tool_calls
-    logger.info(f"Processing {len(tool_calls)} tool call(s)")
+    logger.info("Processing %d tool call(s)", len(tool_calls))
+
+    # Bound the number of in-flight calls to avoid flooding the server
+    semaphore = asyncio.Semaphore(MAX_TOOL_CONCURRENCY)
+
+    async def _run(i: int, tool_call) -> Dict[str, str]:
+        async with semaphore:
+            return await _execute_single_tool_call(
+                session, tool_call, i, len(tool_calls)
+            )
+
+    # Execute tool calls concurrently; gather preserves the original order
+    results = await asyncio.gather(
+        *(_run(i, tool_call) for i, tool_call in enumerate(tool_calls)),
+        return_exceptions=True,
+    )
+
+    tool_result_messages = []
+    for tool_call, result in zip(tool_calls, results):
+        if isinstance(result, BaseException):
+            logger.error("Error executing tool %s: %s", tool_call.function.name, result)
+            result = {
+                "role": "tool",
+                "tool_call_id": tool_call.id,
+                "content": f"Error executing tool: {str(result)}",
+            }
+        tool_result_messages.append(result)
+
+    messages.extend(tool_result_messages)
+    return tool_result_messages
+
+
+def _is_terminal_tool_result(assistant_message, results: List[Dict[str, str]]) -> bool:
+    """Check whether a tool result can be returned without a final OpenAI call.
+
+    This holds for a single successful call to a passthrough tool when the
+    assistant gave no content of its own alongside the call.
+
+    Args:
+        assistant_message: The assistant's message with tool calls.
+        results: The tool result messages for its tool calls.
+
+    Returns:
+        True if the tool result is the final answer.
+    """
+    tool_calls = assistant_message.tool_calls
+    return (
+        len(tool_calls) == 1
+        and tool_calls[0].function.name in PASSTHROUGH_TOOLS
+        and not assistant_message.content
+        and not results[0]["content"].startswith(TOOL_ERROR_PREFIXES)
+    )
+
+
+async def _resolve_selected_tools(
+    session, assistant_message, messages: List[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """Resolve `select_tool` calls into the full definitions of the chosen tools.
+
+    Any regular tool calls made in the same turn are executed as usual.
+
+    Args:
+        session: The MCP session.
+        assistant_message: The assistant's message with `select_tool` calls.
+        messages: The conversation messages list to append selection results to.
+
+    Returns:
+        List of the selected tools formatted for OpenAI API.
+    """
+    selected_tools = []
+    tool_calls = assistant_message.tool_calls
 
-    # Process each tool call
     for i, tool_call in enumerate(tool_calls):
-        tool_result_message = await _execute_single_tool_call(
-            session, tool_call, i, len(tool_calls)
+        if tool_call.function.name != SELECT_TOOL_NAME:
+            messages.append(
+                await _execute_single_tool_call(session, tool_call, i, len(tool_calls))
+            )
+            continue
+
+        schema = None
+        try:
+            name = _json_loads(tool_call.function.arguments)["name"]
+            schema = await get_mcp_tool_schema(session, name)
+        except Exception as e:
+            logger.error("Invalid tool selection: %s", e)
+
+        if schema is None:
+            content = f"Unknown tool selection: {tool_call.function.arguments}"
+        else:
+            if schema not in selected_tools:
+                selected_tools.append(schema)
+            content = f"Tool {schema['function']['name']} is now available."
+
+        messages.append(
+            {"role": "tool", "tool_call_id": tool_call.id, "content": content}
         )
-        messages.append(tool_result_message)
+
+    logger.info(
+        "Selected tools: %s", [tool["function"]["name"] for tool in selected_tools]
+    )
+    return selected_tools
+
+
+def _has_tool_selection(assistant_message) -> bool:
+    """Check whether the assistant asked for the definition of a tool.
+
+    Args:
+        assistant_message: The assistant's message.
+
+    Returns:
+        True if any tool call is a `select_tool` call.
+    """
+    return any(
+        tool_call.function.name == SELECT_TOOL_NAME
+        for tool_call in assistant_message.tool_calls or ()
+    )
 
 
 async def _make_openai_call(
@@ -181,23 +332,26 @@ async def _make_openai_call(
     Returns:
         The OpenAI API response.
     """
-    logger.info(f"Making {call_type} OpenAI API call...")
-    logger.debug(f"Using model: {model}")
-    logger.debug(f"Tools available: {tools is not None}")
-    logger.debug(f"Number of messages: {len(messages)}")
-
-    response = await openai_client.chat.completions.create(
-        model=model,
-        messages=messages,
-        tools=tools if tools else None,
-        tool_choice=tool_choice if tools else None,
-    )
+    logger.info("Making %s OpenAI API call...", call_type)
+    logger.debug("Using model: %s", model)
+    logger.debug("Tools available: %s", tools is not None)
+    logger.debug("Number of messages: %d", len(messages))
+
+    async with profiler.span("openai", call_type=call_type):
+        response = await openai_client.chat.completions.create(
+            model=model,
+            messages=messages,
+            tools=tools if tools else None,
+            tool_choice=tool_choice if tools else None,
+        )
 
-    logger.info(f"Received response from OpenAI ({call_type})")
+    logger.info("Received response from OpenAI (%s)", call_type)
     return response
 
 
-async def process_query_with_resource_tools(session, query: str) -> str:
+async def process_query_with_resource_tools(
+    session, query: str, allow_passthrough: bool = True
+) -> str:
     """Process a query using OpenAI with MCP tools and on-demand resource fetching.
 
     This version only provides resource metadata initially and fetches content on demand.
@@ -205,26 +359,38 @@ async def process_query_with_resource_tools(session, query: str) -> str:
     Args:
         session: The MCP session.
         query: The user query.
+        allow_passthrough: Whether a passthrough tool result may be returned
+            as-is, without a final OpenAI call.
 
     Returns:
         The response from OpenAI.
     """
     try:
-        logger.info(f"Starting query processing: {query}")
-
-        # Get available tools and resources
-        logger.info("Fetching available MCP tools...")
-        tools = await get_mcp_tools(session)
+        logger.info("Starting query processing: %s", query)
+
+        # Fetch tools and resources metadata in a single pass
+        logger.info("Fetching available MCP tools and resources metadata...")
+        try:
+            server_info = await get_cached_server_info(session)
+        except Exception as e:
+            logger.error("Error getting MCP server info: %s", e)
+            server_info = {"tools": [], "resources": []}
+
+        # With many or large tools, offer a compact index and send schemas on demand
+        lazy_tools = use_lazy_tool_schemas(server_info)
+        if lazy_tools:
+            tools = [build_select_tool(format_mcp_tool_index(server_info))]
+        else:
+            tools = format_mcp_tools(server_info)
         _log_tools_info(tools)
 
-        logger.info("Fetching available MCP resources metadata...")
-        resources_info = await get_mcp_resources(session)
+        resources_info = format_mcp_resources(server_info)
         _log_resources_info(resources_info)
 
         # Build system message and conversation
         system_message = _build_system_message(resources_info)
-        logger.info(f"System message length: {len(system_message)} characters")
-        logger.debug(f"System message: {system_message}")
+        logger.info("System message length: %d characters", len(system_message))
+        logger.debug("System message: %s", system_message)
 
         messages = [
             {"role": "system", "content": system_message},
@@ -239,9 +405,37 @@ async def process_query_with_resource_tools(session, query: str) -> str:
         _log_assistant_response(assistant_message)
         messages.append(assistant_message)
 
+        # Resolve tool selections and let the model call the chosen tools;
+        # select_tool stays available so further tools can still be picked
+        selection_rounds = 0
+        while (
+            lazy_tools
+            and _has_tool_selection(assistant_message)
+            and selection_rounds < MAX_TOOL_SELECTION_ROUNDS
+        ):
+            selection_rounds += 1
+            selected_tools = await _resolve_selected_tools(
+                session, assistant_message, messages
+            )
+            tools += [tool for tool in selected_tools if tool not in tools]
+            response = await _make_openai_call(
+                messages, tools, TOOL_CHOICE_AUTO, "tool selection"
+            )
+
+            assistant_message = response.choices[0].message
+            _log_assistant_response(assistant_message)
+            messages.append(assistant_message)
+
         # Handle tool calls if present
         if assistant_message.tool_calls:
-            await _process_tool_calls(session, assistant_message, messages)
+            results = await _process_tool_calls(session, assistant_message, messages)
+
+            # Skip the final call when the tool output already answers the query
+            if allow_passthrough and _is_terminal_tool_result(
+                assistant_message, results
+            ):
+                logger.info("Returning tool result directly, skipping final call")
+                return results[0]["content"]
 
             # Get final response from OpenAI with tool results
             final_response = await _make_openai_call(
@@ -249,17 +443,83 @@ async def process_query_with_resource_tools(session, query: str) -> str:
             )
 
             final_content = final_response.choices[0].message.content
-            logger.info(f"Final response preview: {(final_content or 'None')[:100]}...")
+            logger.info("Final response preview: %.100s...", final_content or "None")
             return final_content
 
         # No tool calls, return direct response
         logger.info("No tool calls were made, returning direct response")
         direct_content = assistant_message.content
-        logger.info(f"Direct response preview: {(direct_content or 'None')[:100]}...")
+        logger.info("Direct response preview: %.100s...", direct_content or "None")
         return direct_content
 
     except Exception as e:
-        logger.error(f"Error processing query: {e}")
-        logger.error(f"Exception type: {type(e).__name__}")
-        logger.error(f"Full traceback: {traceback.format_exc()}")
+        logger.error("Error processing query: %s", e)
+        logger.error("Exception type: %s", type(e).__name__)
+        logger.error("Full traceback: %s", traceback.format_exc())
         return f"Sorry, I encountered an error while processing your query: {str(e)}"
+
+
+def _split_numbered_answers(content: Optional[str], count: int) -> Optional[List[str]]:
+    """Split a numbered-list response into one answer per question.
+
+    Args:
+        content: The response content.
+        count: The number of questions that were asked.
+
+    Returns:
+        The answers in question order, or None if the response does not
+        contain exactly one line starting with each number, in order.
+    """
+    if not content:
+        return None
+
+    markers = []
+    for i in range(1, count + 1):
+        matches = list(re.finditer(rf"^[ \t]*{i}\.[ \t]*", content, re.MULTILINE))
+        # A number that starts several lines (e.g. a nested list) is ambiguous
+        if len(matches) != 1:
+            return None
+        if markers and matches[0].start() <= markers[-1].start():
+            return None
+        markers.append(matches[0])
+
+    ends = [marker.start() for marker in markers[1:]] + [len(content)]
+    return [content[marker.end() : end].strip() for marker, end in zip(markers, ends)]
+
+
+async def process_queries_batch(session, queries: List[str]) -> List[str]:
+    """Process several independent queries with a single conversation.
+
+    The queries are combined into one numbered prompt so they share the
+    OpenAI round-trips. If the response cannot be split back into one answer
+    per query, each query is processed on its own instead.
+
+    Args:
+        session: The MCP session.
+        queries: The user queries.
+
+    Returns:
+        The responses, in the same order as the queries.
+    """
+    if len(queries) <= 1:
+        return [await process_query_with_resource_tools(session, q) for q in queries]
+
+    logger.info("Processing batch of %d queries", len(queries))
+    batch_query = BATCH_PROMPT + "\n".join(
+        f"{i}. {query}" for i, query in enumerate(queries, start=1)
+    )
+    # A raw tool result carries no numbering, so always ask for a final answer
+    response = await process_query_with_resource_tools(
+        session, batch_query, allow_passthrough=False
+    )
+
+    answers = _split_numbered_answers(response, len(queries))
+    if answers is not None:
+        return answers
+
+    logger.warning("Could not split batched response, processing queries separately")
+    return list(
+        await asyncio.gather(
+            *(process_query_with_resource_tools(session, q) for q in queries)
+        )
+    )
@@ -1,7 +1,28 @@
 from typing import Any, Dict, List
 
 from apps.client.src.logging_config import logger
-from apps.client.src.mcp_connection import get_server_info
+from apps.client.src.mcp_connection import get_cached_server_info, profiler
+
+
+def format_mcp_resources(server_info: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Format the resources from already fetched server info for OpenAI API.
+
+    Args:
+        server_info: Server info from `get_server_info`.
+
+    Returns:
+        List of resources formatted for OpenAI API.
+    """
+    return [
+        {
+            "type": "resource",
+            "resource": {
+                "name": resource["name"],
+                "description": resource["description"],
+            },
+        }
+        for resource in server_info["resources"]
+    ]
 
 
 async def get_mcp_resources(session) -> List[Dict[str, Any]]:
@@ -14,23 +35,10 @@ async def get_mcp_resources(session) -> List[Dict[str, Any]]:
         List of resources formatted for OpenAI API.
     """
     try:
-        server_info = await get_server_info(session)
-        resources = []
-
-        for resource in server_info["resources"]:
-            resources.append(
-                {
-                    "type": "resource",
-                    "resource": {
-                        "name": resource["name"],
-                        "description": resource["description"],
-                    },
-                }
-            )
-
-        return resources
+        server_info = await get_cached_server_info(session)
+        return format_mcp_resources(server_info)
     except Exception as e:
-        logger.error(f"Error getting MCP resources: {e}")
+        logger.error("Error getting MCP resources: %s", e)
         return []
 
 
@@ -46,13 +54,15 @@ async def get_resources_content(session) -> dict:
     resources_content = {}
     try:
         # List available resources
-        resources_result = await session.list_resources()
+        async with profiler.span("list_resources"):
+            resources_result = await session.list_resources()
 
         # Fetch content for each resource
         for resource in resources_result.resources:
             try:
-                logger.info(f"Fetching content for resource: {resource.name}")
-                content_result = await session.read_resource(resource.uri)
+                logger.info("Fetching content for resource: %s", resource.name)
+                async with profiler.span("read_resource", resource=resource.name):
+                    content_result = await session.read_resource(resource.uri)
 
                 # Extract text content
                 if content_result.contents:
@@ -70,6 +80,6 @@ async def get_resources_content(session) -> dict:
                 resources_content[resource.name] = f"[Content unavailable: {str(e)}]"
 
     except Exception as e:
-        logger.error(f"Error fetching resources content: {e}")
+        logger.error("Error fetching resources content: %s", e)
 
     return resources_content
@@ -1,7 +1,74 @@
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 from apps.client.src.logging_config import logger
-from apps.client.src.mcp_connection import get_server_info
+from apps.client.src.mcp_connection import get_cached_server_info
+
+SELECT_TOOL_NAME = "select_tool"
+
+# Below these limits the full tool schemas are cheaper than an extra selection call
+LAZY_TOOLS_MIN_COUNT = 10
+LAZY_TOOLS_MIN_SCHEMA_CHARS = 8000
+
+
+def _format_openai_tool(tool: Dict[str, Any]) -> Dict[str, Any]:
+    """Format a single MCP tool for the OpenAI API.
+
+    Args:
+        tool: Tool information dictionary from the server info.
+
+    Returns:
+        The tool formatted for OpenAI API.
+    """
+    return {
+        "type": "function",
+        "function": {
+            "name": tool["name"],
+            "description": tool["description"],
+            "parameters": tool.get("inputSchema", {}),
+        },
+    }
+
+
+def format_mcp_tools(server_info: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Format the tools from already fetched server info for OpenAI API.
+
+    Args:
+        server_info: Server info from `get_server_info`.
+
+    Returns:
+        List of tools formatted for OpenAI API.
+    """
+    return [_format_openai_tool(tool) for tool in server_info["tools"]]
+
+
+def format_mcp_tool_index(server_info: Dict[str, Any]) -> List[Dict[str, str]]:
+    """Build a compact tool index from already fetched server info.
+
+    Args:
+        server_info: Server info from `get_server_info`.
+
+    Returns:
+        List of dictionaries with the name and description of each tool.
+    """
+    return [
+        {"name": tool["name"], "description": tool["description"]}
+        for tool in server_info["tools"]
+    ]
+
+
+def use_lazy_tool_schemas(server_info: Dict[str, Any]) -> bool:
+    """Check whether the tool schemas are large enough to be sent on demand.
+
+    Args:
+        server_info: Server info from `get_server_info`.
+
+    Returns:
+        True if the model should pick tools from an index first.
+    """
+    return (
+        len(server_info["tools"]) >= LAZY_TOOLS_MIN_COUNT
+        or server_info.get("tool_schema_chars", 0) >= LAZY_TOOLS_MIN_SCHEMA_CHARS
+    )
 
 
 async def get_mcp_tools(session) -> List[Dict[str, Any]]:
@@ -14,22 +81,85 @@ async def get_mcp_tools(session) -> List[Dict[str, Any]]:
         List of tools formatted for OpenAI API.
     """
     try:
-        server_info = await get_server_info(session)
-        tools = []
+        server_info = await get_cached_server_info(session)
+        return format_mcp_tools(server_info)
+    except Exception as e:
+        logger.error("Error getting MCP tools: %s", e)
+        return []
 
-        for tool in server_info["tools"]:
-            tools.append(
-                {
-                    "type": "function",
-                    "function": {
-                        "name": tool["name"],
-                        "description": tool["description"],
-                        "parameters": tool.get("inputSchema", {}),
-                    },
-                }
-            )
-
-        return tools
+
+async def get_mcp_tool_index(session) -> List[Dict[str, str]]:
+    """Get a compact index of available MCP tools without their schemas.
+
+    Args:
+        session: The MCP session.
+
+    Returns:
+        List of dictionaries with the name and description of each tool.
+    """
+    try:
+        server_info = await get_cached_server_info(session)
+        return format_mcp_tool_index(server_info)
     except Exception as e:
-        logger.error(f"Error getting MCP tools: {e}")
+        logger.error("Error getting MCP tool index: %s", e)
         return []
+
+
+async def get_mcp_tool_schema(session, name: str) -> Optional[Dict[str, Any]]:
+    """Get the full OpenAI definition of a single MCP tool.
+
+    The schema is served from the cached server info, so repeated lookups
+    do not hit the server.
+
+    Args:
+        session: The MCP session.
+        name: Name of the tool.
+
+    Returns:
+        The tool formatted for OpenAI API, or None if it does not exist.
+    """
+    try:
+        server_info = await get_cached_server_info(session)
+        for tool in server_info["tools"]:
+            if tool["name"] == name:
+                return _format_openai_tool(tool)
+
+        logger.warning("Unknown MCP tool requested: %s", name)
+        return None
+    except Exception as e:
+        logger.error("Error getting schema for MCP tool %s: %s", name, e)
+        return None
+
+
+def build_select_tool(tool_index: List[Dict[str, str]]) -> Dict[str, Any]:
+    """Build the meta-tool the model uses to pick a tool from the index.
+
+    Args:
+        tool_index: Compact tool index from `get_mcp_tool_index`.
+
+    Returns:
+        The `select_tool` meta-tool formatted for OpenAI API.
+    """
+    tool_list = "\n".join(
+        f"- {tool['name']}: {tool['description']}" for tool in tool_index
+    )
+    return {
+        "type": "function",
+        "function": {
+            "name": SELECT_TOOL_NAME,
+            "description": (
+                "Select a tool to use. Its full definition is provided after "
+                f"selection.\n\nAvailable tools:\n{tool_list}"
+            ),
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "name": {
+                        "type": "string",
+                        "enum": [tool["name"] for tool in tool_index],
+                    }
+                },
+                "required": ["name"],
+            },
+        },
+    }
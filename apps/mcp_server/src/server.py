@@ -1,27 +1,48 @@
+import asyncio
+import functools
+import inspect
+import logging
 import os
+import sys
+from typing import Awaitable, Callable, Dict, Tuple, Union
 
-from dotenv import load_dotenv
 from mcp.server.fastmcp import FastMCP
 
-from apps.client.src.logging_config import logger
+from apps.client.src.logging_config import (
+    debug,
+    error,
+    info,
+    log_target,
+    logger,
+    warning,
+)
 
-load_dotenv("../.env")
+# Cached for the debug-level guards in the request handlers
+_DEBUG = logging.DEBUG
+_debug_enabled = logger.isEnabledFor
 
-mcp = FastMCP(name="Fred")
-logger.info("Initialized MCP server 'Fred'")
+# Interned log formats shared by every record from the request handlers
+_CALC_LOG_FMT = sys.intern("Calculator tool: %s + %s = %s")
+_GREET_LOG_FMT = sys.intern("Generating greeting for: %s")
+
+# Configuration is materialized once at import so serving it is a plain return
+_CONFIG_PAYLOAD = "App configuration here"
+
+# Fixed parts of the greeting resource text
+_GREETING_PREFIX = "Hello, "
+_GREETING_SUFFIX = "!"
 
 
 # Add a simple calculator tool
-@mcp.tool()
 def add(a: int, b: int) -> int:
     """Add two numbers together"""
     result = a + b
-    logger.debug(f"Calculator tool: {a} + {b} = {result}")
+    if __debug__ and _debug_enabled(_DEBUG):
+        debug(_CALC_LOG_FMT, a, b, result)
     return result
 
 
-@mcp.tool()
-def read_resource_content(resource_uri: str) -> str:
+async def read_resource_content(resource_uri: str) -> str:
     """Read the content of a specific MCP resource by its URI.
 
     Args:
@@ -30,86 +51,169 @@ def read_resource_content(resource_uri: str) -> str:
     Returns:
         The content of the requested resource
     """
-    logger.debug(f"Reading resource content for URI: {resource_uri}")
+    if __debug__:
+        debug("Reading resource content for URI: %s", resource_uri)
 
     try:
-        # Handle different resource types
-        if resource_uri == "data://list":
-            return list_all_data_products()
-        elif resource_uri == "data://list_all_data_products":
-            return list_all_data_products()
-        elif resource_uri == "config://app":
-            return get_config()
-        elif resource_uri == "config://get_config":
-            return get_config()
-        elif resource_uri.startswith("greeting://"):
-            # Extract name from greeting URI
-            name = resource_uri.replace("greeting://", "")
-            return get_greeting(name)
-        else:
-            return f"Unknown resource URI: {resource_uri}"
+        # Serve constant payloads directly, without calling their handler
+        payload = _STATIC.get(resource_uri)
+        if payload is not None:
+            return payload
+
+        # Handle static resource URIs with a single lookup
+        handler = _EXACT.get(resource_uri)
+        if handler is not None:
+            result = handler()
+            return await result if inspect.isawaitable(result) else result
+
+        # Handle parameterized resource URIs by prefix
+        for prefix, prefixed_handler in _PREFIXED:
+            if resource_uri.startswith(prefix):
+                return prefixed_handler(resource_uri[len(prefix) :])
+
+        return f"Unknown resource URI: {resource_uri}"
 
     except Exception as e:
-        logger.error(f"Error reading resource {resource_uri}: {str(e)}")
+        error("Error reading resource %s: %s", resource_uri, e)
         return f"Error reading resource {resource_uri}: {str(e)}"
 
 
-@mcp.resource("config://app")
 def get_config() -> str:
     """Static configuration data"""
-    logger.debug("Serving configuration resource")
-    return "App configuration here"
+    if __debug__ and _debug_enabled(_DEBUG):
+        debug("Serving configuration resource")
+    return _CONFIG_PAYLOAD
 
 
 # Add a dynamic greeting resource
-@mcp.resource("greeting://{name}")
 def get_greeting(name: str) -> str:
     """Get a personalized greeting"""
-    logger.debug(f"Generating greeting for: {name}")
-    return f"Hello, {name}!"
+    if __debug__ and _debug_enabled(_DEBUG):
+        debug(_GREET_LOG_FMT, name)
+    return _format_greeting(name)
+
+
+@functools.lru_cache(maxsize=1024)
+def _format_greeting(name: str) -> str:
+    """Build the greeting text, memoized since names repeat"""
+    return _GREETING_PREFIX + name + _GREETING_SUFFIX
+
 
+# Cached data product listing, keyed on the resources directory mtime
+_data_products_cache = {"mtime": None, "value": None}
 
-@mcp.resource("data://list")
-def list_all_data_products() -> str:
+
+def _scan_data_products(resources_path: str) -> str:
+    """Scan the resources directory and format the data product listing"""
+    # scandir serves is_dir() from the directory read; only symlinks need a stat
+    with os.scandir(resources_path) as entries:
+        data_products = sorted(entry.name for entry in entries if entry.is_dir())
+
+    if not data_products:
+        return "No data products found in the resources directory."
+
+    if __debug__:
+        debug("Found %d data products", len(data_products))
+    return "Available Data Products:\n" + "\n".join(f"- {dp}" for dp in data_products)
+
+
+async def list_all_data_products() -> str:
     """List all available data product names"""
-    logger.debug("Listing all data products")
+    if __debug__:
+        debug("Listing all data products")
 
     resources_path = "resources"
     try:
-        # Get all directories in the resources folder
-        if os.path.exists(resources_path):
-            data_products = [
-                item
-                for item in os.listdir(resources_path)
-                if os.path.isdir(os.path.join(resources_path, item))
-            ]
-
-            if data_products:
-                result = "Available Data Products:\n" + "\n".join(
-                    f"- {dp}" for dp in sorted(data_products)
-                )
-                logger.debug(f"Found {len(data_products)} data products")
-                return result
-            else:
-                return "No data products found in the resources directory."
-        else:
-            logger.warning(f"Resources directory not found at: {resources_path}")
-            return "Resources directory not found."
+        # Adding or removing a data product updates the directory mtime
+        mtime = os.stat(resources_path).st_mtime_ns
+        if mtime == _data_products_cache["mtime"]:
+            return _data_products_cache["value"]
+
+        # Scan off the event loop so other requests keep being served
+        result = await asyncio.to_thread(_scan_data_products, resources_path)
 
+        _data_products_cache["mtime"] = mtime
+        _data_products_cache["value"] = result
+        return result
+
+    except FileNotFoundError:
+        warning("Resources directory not found at: %s", resources_path)
+        return "Resources directory not found."
     except Exception as e:
-        logger.error(f"Error listing data products: {str(e)}")
+        error("Error listing data products: %s", e)
+        if _data_products_cache["value"] is not None:
+            warning("Serving stale data product listing")
+            return _data_products_cache["value"]
         return f"Error accessing data products: {str(e)}"
 
 
+# Dispatch tables for read_resource_content, built once at import
+_STATIC: Dict[str, str] = {
+    "config://app": _CONFIG_PAYLOAD,
+    "config://get_config": _CONFIG_PAYLOAD,
+}
+_EXACT: Dict[str, Callable[[], Union[str, Awaitable[str]]]] = {
+    "data://list": list_all_data_products,
+    "data://list_all_data_products": list_all_data_products,
+}
+_PREFIXED: Tuple[Tuple[str, Callable[[str], str]], ...] = (
+    ("greeting://", get_greeting),
+)
+
+
+def _build_server() -> FastMCP:
+    """Create the MCP server and register its tools and resources.
+
+    Kept out of import so that importing this module (e.g. to inspect the
+    handlers) does not pay for FastMCP initialization.
+
+    Returns:
+        The configured FastMCP server
+    """
+    mcp = FastMCP(name="Fred")
+    mcp.tool()(add)
+    mcp.tool()(read_resource_content)
+    mcp.resource("config://app")(get_config)
+    mcp.resource("greeting://{name}")(get_greeting)
+    mcp.resource("data://list")(list_all_data_products)
+    info("Initialized MCP server 'Fred'")
+    return mcp
+
+
+def __getattr__(name: str) -> FastMCP:
+    """Build the module-level `mcp` server on first access (PEP 562).
+
+    Keeps the server discoverable by `mcp dev` and `mcp run`, which look it
+    up with getattr, without building it on import.
+    """
+    if name != "mcp":
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    server = _build_server()
+    # Later lookups find the global directly and skip this hook
+    globals()["mcp"] = server
+    return server
+
+
+# Supported transports and how to start the server on each
+_TRANSPORTS: Dict[str, Callable[[FastMCP], None]] = {
+    "stdio": lambda mcp: mcp.run(transport="stdio"),
+    "sse": lambda mcp: mcp.run(transport="sse"),
+}
+
+
 # Run the server
 if __name__ == "__main__":
     transport = "stdio"
-    if transport == "stdio":
-        logger.info("Starting MCP server with stdio transport")
-        mcp.run(transport="stdio")
-    elif transport == "sse":
-        logger.info("Starting MCP server with SSE transport")
-        mcp.run(transport="sse")
-    else:
-        logger.error(f"Unknown transport: {transport}")
+    runner = _TRANSPORTS.get(transport)
+    if runner is None:
+        error("Unknown transport: %s", transport)
         raise ValueError(f"Unknown transport: {transport}")
+
+    if transport == "stdio" and log_target is sys.stdout:
+        raise RuntimeError(
+            "Logging to stdout would corrupt the stdio transport; "
+            "unset MCP_LOG_STREAM or set it to 'stderr'"
+        )
+
+    info("Starting MCP server with %s transport", transport)
+    runner(_build_server())